@@ -16,12 +16,54 @@ import subprocess
 import json
 import logging
 import argparse
-from typing import List, Any, Optional, Dict
+import functools
+import re
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, ClassVar, Iterator, List, Any, Optional, Dict, Set, Tuple, NamedTuple
+
+try:
+    from orjson import loads  # optional, several times faster on exiftool output
+except ImportError:
+    from json import loads  # type: ignore[assignment]
 
 LOG_FILE = "xt5_exif_tool.log"
+OUTPUT_CHUNK = 256  # new names written to stdout per write() call
 RECIPES_FILE = os.path.join(os.path.dirname(__file__), "custom_recipes.json")
-
-def setup_logging(verbose: bool):
+# tags read by build_new_name; recipe settings add their own on top
+NAME_TAGS = ["PictureMode", "SequenceNumber", "DriveMode", "ExposureMode",
+             "FilmMode", "AdvancedFilter", "Saturation"]
+# recipe setting names are passed to exiftool as "-Name", so they must look like
+# a tag ("Artist=foo" would be a write) and must not spell an exiftool option:
+# options are matched case-insensitively ("Execute", "Ext", "If" are options)
+# and many take a numeric suffix ("Execute2", "Fast2", "If3")
+TAG_NAME_RE = re.compile(r"[A-Z][A-Za-z0-9]+")
+EXIFTOOL_OPTIONS = frozenset("""
+    api argformat args binary charset coordformat common_args composite config csv
+    csvdelim dateformat decimal delete_original diff duplicates echo ec ee efile
+    escapec escapehtml escapexml ex exclude execute ext extension extractembedded
+    fast file fileorder fixbase forceprint geolocate geosync geotag groupheadings
+    groupnames help hex htmldump htmlformat if ignore ignoreminorerrors json lang
+    latin list list_dir listd listf listg listgeo listitem listr listw listwf listx
+    long out overwrite_original overwrite_original_in_place password pause php
+    preserve printconv printformat progress quiet recurse restore_original
+    scanforxmp sep separator short sort srcfile stay_open struct tab table
+    tagout tagsfromfile textout unknown unknown2 use verbose ver veryshort wext
+    wm writemode xmlformat zip
+""".split())
+
+def is_tag_name(name: str) -> bool:
+    """True if "-name" can only be read by exiftool as a tag to extract."""
+    if not TAG_NAME_RE.fullmatch(name):
+        return False
+    lower = name.lower()
+    base = lower.rstrip("0123456789")
+    # single letters are options too, with or without a number ("G1", "v3")
+    return len(base) > 1 and lower not in EXIFTOOL_OPTIONS and base not in EXIFTOOL_OPTIONS
+
+def setup_logging(verbose: bool) -> None:
     logger = logging.getLogger()
     logger.handlers.clear()
     if not verbose:
@@ -33,61 +75,254 @@ def setup_logging(verbose: bool):
     fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
     logger.addHandler(fh)
 
-def get_exif_via_exiftool(filepath: str) -> dict:
-    try:
-        res = subprocess.run(
-            ["exiftool", "-json", "-G", filepath],
-            capture_output=True, text=True, check=True
+class ExifToolDaemon:
+    """
+    One long-lived exiftool process (-stay_open) shared by all files,
+    so the Perl startup cost is paid once per run instead of once per image.
+    Only `tags` are requested, with -fast so exiftool doesn't scan past the
+    metadata for trailers; tags=None dumps every tag with group names.
+    -fast2 is not an option: it skips the MakerNotes, where Fuji keeps all of these.
+    """
+
+    READY = b"{ready}"
+    WINDOW: ClassVar[int] = 8  # requests kept in flight by iter_exif
+
+    def __init__(self, tags: Optional[List[str]] = None) -> None:
+        self._reader: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._drained = True  # False while iter_exif replies are still unread
+        self.failed: List[str] = []  # paths whose EXIF couldn't be read
+        if tags is None:
+            self.args = b"-json\n-G\n"
+        else:
+            self.args = b"-json\n-fast\n" + b"".join(os.fsencode(f"-{t}\n") for t in tags)
+        try:
+            self._start()
+        except FileNotFoundError:
+            logging.error("exiftool not found. Install it first.")
+            sys.exit(1)
+
+    def _start(self) -> None:
+        self.proc = subprocess.Popen(
+            ["exiftool", "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
-        data = json.loads(res.stdout)
+        # both are set since we asked for PIPE
+        self.stdin: IO[bytes] = self.proc.stdin  # type: ignore[assignment]
+        self.stdout: IO[bytes] = self.proc.stdout  # type: ignore[assignment]
+
+    def _restart(self) -> None:
+        self.proc.kill()
+        self.proc.wait()
+        for pipe in (self.stdin, self.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        if not self._stop.is_set():
+            self._start()
+
+    def iter_exif(self, paths: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (path, exif) in order. A reader thread keeps up to WINDOW requests
+        queued in exiftool and parses replies into a bounded queue, so exiftool
+        reads the next files while the caller is still processing earlier ones.
+        Only the reader thread touches exiftool's pipes until the iterator ends.
+
+        If exiftool dies, the file it was reading is yielded with empty EXIF and
+        exiftool is restarted for the rest. Every path is yielded exactly once;
+        the ones without EXIF are listed in self.failed.
+        """
+        q: "queue.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = queue.Queue(maxsize=self.WINDOW)
+        stop = self._stop
+
+        def put(item: Optional[Tuple[str, Dict[str, Any]]]) -> bool:
+            # give up once the consumer has gone away instead of blocking forever
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def reader() -> None:
+            todo = deque(paths)
+            pending: "deque[str]" = deque()  # sent to exiftool, reply not read yet
+            can_send = True
+            try:
+                while todo or pending:
+                    if stop.is_set():
+                        return
+                    if can_send:
+                        try:
+                            while todo and len(pending) < self.WINDOW:
+                                pending.append(todo.popleft())
+                                self._send(pending[-1])
+                        except (OSError, ValueError):
+                            # exiftool is gone, but replies it already wrote can still be read
+                            can_send = False
+                    path = pending.popleft()
+                    try:
+                        exif = self._receive(path)
+                    except EOFError:
+                        if stop.is_set():
+                            return
+                        # requests are handled in order, so exiftool died on this one
+                        logging.error(f"exiftool exited unexpectedly on {path}; restarting it")
+                        self.failed.append(path)
+                        todo.extendleft(reversed(pending))
+                        pending.clear()
+                        self._restart()
+                        can_send = True
+                        exif = {}
+                    if not put((path, exif)):
+                        return
+            except OSError as e:
+                logging.error(f"Could not restart exiftool: {e}")
+            finally:
+                put(None)
+
+        self._drained = False
+        self._reader = threading.Thread(target=reader, daemon=True)
+        self._reader.start()
+        try:
+            done = 0
+            while True:
+                item = q.get()
+                if item is None:
+                    self._drained = True
+                    # reader gave up early (exiftool couldn't be restarted)
+                    for path in paths[done:]:
+                        self.failed.append(path)
+                        yield path, {}
+                    return
+                done += 1
+                yield item
+        finally:
+            stop.set()
+
+    def _send(self, filepath: str) -> None:
+        self.stdin.write(self.args + os.fsencode(filepath) + b"\n-execute\n")
+        self.stdin.flush()
+
+    def _receive(self, filepath: str) -> Dict[str, Any]:
+        lines: List[bytes] = []
+        while True:
+            line = self.stdout.readline()
+            if not line:
+                raise EOFError(f"exiftool closed its output while reading {filepath}")
+            if line.rstrip(b"\r\n") == self.READY:
+                break
+            lines.append(line)
+        out = b"".join(lines).strip()
+        if not out:
+            logging.error(f"exiftool error on {filepath}")
+            return {}
+        try:
+            data = loads(out)
+        except ValueError as e:
+            logging.error(f"exiftool returned invalid JSON for {filepath}: {e}")
+            return {}
         logging.debug(f"Loaded EXIF for {filepath}")
         return data[0] if data else {}
-    except FileNotFoundError:
-        logging.error("exiftool not found. Install it first.")
-        sys.exit(1)
-    except subprocess.CalledProcessError as e:
-        logging.error(f"exiftool error on {filepath}: {e}")
-        return {}
 
-def dump_all_exif(filepath: str, exif: dict) -> None:
+    def close(self) -> None:
+        if not self._drained:
+            # iteration was abandoned: exiftool may be blocked writing replies
+            # nobody will read, so stop it rather than asking it to finish
+            self._stop.set()
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+            if self._reader is not None:
+                self._reader.join()
+            if self.proc.poll() is None:  # restarted by the reader meanwhile
+                self.proc.kill()
+                self.proc.wait()
+            return
+        if self._reader is not None:
+            self._reader.join()
+        try:
+            self.stdin.write(b"-stay_open\nFalse\n")
+            self.stdin.flush()
+            self.stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass
+        self.proc.wait()
+
+    def __enter__(self) -> "ExifToolDaemon":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class LazyJson:
+    """Defers json.dumps until a log handler actually formats the record."""
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=2, ensure_ascii=False)
+
+def dump_all_exif(filepath: str, exif: Dict[str, Any]) -> None:
+    logger = logging.getLogger()
+    if not logger.isEnabledFor(logging.INFO):
+        return
     fname = os.path.basename(filepath)
-    formatted = json.dumps(exif, indent=2, ensure_ascii=False)
-    logging.info(f"--- Formatted EXIF for {fname} ---\n{formatted}")
-    for tag, val in sorted(exif.items()):
-        logging.debug(f"{tag}: {val}")
+    logging.info("--- Formatted EXIF for %s ---\n%s", fname, LazyJson(exif))
+    if logger.isEnabledFor(logging.DEBUG):
+        for tag, val in sorted(exif.items()):
+            logging.debug("%s: %s", tag, val)
 
-def fetch(exif: dict, tag_name: str, default: Optional[Any] = None) -> Any:
+def normalize(exif: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map short tag names to values, dropping group prefixes ("MakerNotes:FilmMode")
+    and None values. The first occurrence of a tag wins.
+    """
+    norm: Dict[str, Any] = {}
     for key, val in exif.items():
-        if val is None:
-            continue
-        if key == tag_name or key.endswith(f":{tag_name}"):
-            return val
-    return default
+        if val is not None:
+            norm.setdefault(key.rpartition(":")[2], val)
+    return norm
+
+def recipe_list(data: Any) -> Optional[List[Dict[str, Any]]]:
+    """Recipe dicts from a parsed JSON array, or None if data isn't a list."""
+    if not isinstance(data, list):
+        return None
+    return [r for r in data if isinstance(r, dict)]
 
 def parse_recipes_json(s: Optional[str]) -> List[Dict[str, Any]]:
     if not s:
         return []
     try:
-        data = json.loads(s)
-        if isinstance(data, list):
-            return [r for r in data if isinstance(r, dict)]
+        recipes = recipe_list(json.loads(s))
+        if recipes is not None:
+            return recipes
         logging.warning("recipes-json is not a list; ignoring.")
     except Exception as e:
         logging.warning(f"Failed to parse recipes-json: {e}")
     return []
 
+@functools.lru_cache(maxsize=4)
+def _load_default_recipes(path: str, mtime_ns: int) -> List[Dict[str, Any]]:
+    # mtime_ns is only part of the cache key, so edits to the file are picked up
+    with open(path, "r", encoding="utf-8") as f:
+        return recipe_list(json.load(f)) or []
+
 def load_recipes(extra_json: Optional[str]) -> List[Dict[str, Any]]:
     # load defaults
     base: List[Dict[str, Any]] = []
     try:
-        if os.path.isfile(RECIPES_FILE):
-            with open(RECIPES_FILE, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-                if isinstance(loaded, list):
-                    base = [r for r in loaded if isinstance(r, dict)]
-                logging.debug(f"Loaded {len(base)} default recipes from {RECIPES_FILE}")
-        else:
-            logging.debug(f"No default recipes file at {RECIPES_FILE}")
+        base = _load_default_recipes(RECIPES_FILE, os.stat(RECIPES_FILE).st_mtime_ns)
+        logging.debug(f"Loaded {len(base)} default recipes from {RECIPES_FILE}")
+    except FileNotFoundError:
+        logging.debug(f"No default recipes file at {RECIPES_FILE}")
     except Exception as e:
         logging.warning(f"Could not load default recipes: {e}")
 
@@ -99,47 +334,140 @@ def load_recipes(extra_json: Optional[str]) -> List[Dict[str, Any]]:
     logging.info(f"Total recipes (extras+defaults): {len(merged)}")
     return merged
 
-def match_recipe(exif: dict, recipes: List[Dict[str, Any]]) -> Optional[str]:
+_MISSING = object()
+
+class Recipe(NamedTuple):
+    name: Any
+    tag: str  # name without spaces, as used in the file name
+    checks: Tuple[Tuple[str, Any], ...]
+
+class RecipeMatcher:
     """
-    Return the first recipe name whose settings all match the EXIF.
-    Logs each tag comparison: expected vs actual.
+    Recipes compiled once into Recipe tuples with ((tag, expected), ...) checks,
+    so matching an image doesn't re-walk and re-validate the raw JSON.
+
+    Recipes are also indexed by the tag most of them constrain (ties go to the
+    tag with the most distinct expected values): an image is only checked against
+    recipes expecting its value for that tag, plus the ones that don't constrain it.
+    Candidates keep their original order, so the first match still wins.
     """
-    for rec in recipes:
-        name = rec.get("name")
-        settings = rec.get("settings", {})
-        if not isinstance(settings, dict):
-            continue
-        all_match = True
-        for tag, expected in settings.items():
-            actual = fetch(exif, tag)
-            logging.debug(f"Recipe '{name}' check: {tag}: expected '{expected}', got '{actual}'")
-            if actual != expected:
-                all_match = False
-                break
-        if all_match:
-            logging.info(f"Matched recipe '{name}'")
-            return name
-    return None
 
-def build_new_name(filepath: str, exif: dict, recipes: List[Dict[str, Any]]) -> str:
+    def __init__(self, recipes: List[Dict[str, Any]]) -> None:
+        self.recipes: List[Recipe] = []
+        for raw in recipes:
+            settings = raw.get("settings", {})
+            if isinstance(settings, dict):
+                name = raw.get("name")
+                # keys copied from the --dump-all log carry a group ("MakerNotes:FilmMode");
+                # drop it, the same way normalize() does for the EXIF side
+                checks = tuple((str(tag).rpartition(":")[2], expected) for tag, expected in settings.items())
+                self.recipes.append(Recipe(name, str(name).replace(" ", ""), checks))
+
+        counts: Dict[str, int] = {}
+        values: Dict[str, Set[Any]] = {}
+        for rec in self.recipes:
+            for tag, expected in rec.checks:
+                counts[tag] = counts.get(tag, 0) + 1
+                try:
+                    values.setdefault(tag, set()).add(expected)
+                except TypeError:
+                    pass
+        self.key_tag: str = max(
+            counts, key=lambda t: (counts[t], len(values.get(t, ()))), default="")
+        buckets: Dict[Any, List[int]] = {}
+        unkeyed: List[int] = []
+        for i, rec in enumerate(self.recipes):
+            expected = dict(rec.checks).get(self.key_tag, _MISSING)
+            if expected is _MISSING:
+                unkeyed.append(i)
+                continue
+            try:
+                buckets.setdefault(expected, []).append(i)
+            except TypeError:
+                unkeyed.append(i)  # unhashable expected value (list/dict), always check it
+        self.unkeyed = [self.recipes[i] for i in unkeyed]
+        self.index = {val: [self.recipes[i] for i in sorted(idx + unkeyed)]
+                      for val, idx in buckets.items()}
+
+    def candidates(self, norm: Dict[str, Any]) -> List[Recipe]:
+        try:
+            return self.index.get(norm.get(self.key_tag), self.unkeyed)
+        except TypeError:
+            return self.unkeyed
+
+    def match(self, norm: Dict[str, Any]) -> Optional[Recipe]:
+        """
+        Return the first recipe whose settings all match the normalized EXIF.
+        With debug logging on, logs each tag comparison: expected vs actual.
+        """
+        # verbose runs check every recipe so the log shows why each one failed
+        verbose = logging.getLogger().isEnabledFor(logging.DEBUG)
+        for rec in (self.recipes if verbose else self.candidates(norm)):
+            for tag, expected in rec.checks:
+                actual = norm.get(tag)
+                if verbose:
+                    logging.debug(f"Recipe '{rec.name}' check: {tag}: expected '{expected}', got '{actual}'")
+                if actual != expected:
+                    break
+            else:
+                logging.info(f"Matched recipe '{rec.name}'")
+                return rec
+        return None
+
+def exif_tags(matcher: RecipeMatcher) -> List[str]:
+    """
+    Tags worth asking exiftool for: NAME_TAGS plus every recipe setting that looks
+    like a tag name. Anything else is never requested, so it can never match.
+    """
+    tags = list(NAME_TAGS)
+    for rec in matcher.recipes:
+        for t, _ in rec.checks:
+            if t in tags:
+                continue
+            if is_tag_name(t):
+                tags.append(t)
+            else:
+                logging.warning(f"Recipe '{rec.name}': '{t}' is not a valid tag name; ignoring it")
+    return tags
+
+def build_new_name(filepath: str, exif: Dict[str, Any], matcher: RecipeMatcher) -> str:
     fname = os.path.basename(filepath)
     base, ext = os.path.splitext(fname)
+    norm = normalize(exif)
 
     # Try to match recipe first
-    recipe_name = match_recipe(exif, recipes)
+    recipe = matcher.match(norm)
+
+    key = (norm.get("PictureMode", ""), norm.get("SequenceNumber", 0),
+           norm.get("DriveMode", ""), norm.get("ExposureMode", ""),
+           norm.get("FilmMode", ""), norm.get("AdvancedFilter", ""),
+           norm.get("Saturation", ""), recipe.tag if recipe and recipe.name else None)
+    # verbose runs skip the cache so every file logs which tags were applied
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        if recipe and recipe.name:
+            # logged here so the log shows the recipe name, not the cached tag
+            logging.debug(f"Applied Recipe tag: {recipe.name}")
+        suffix = _suffix_for.__wrapped__(*key)
+    else:
+        try:
+            suffix = _suffix_for(*key)
+        except TypeError:  # unhashable tag value
+            suffix = _suffix_for.__wrapped__(*key)
+    return f"{base}{suffix}{ext}"
 
-    tags: List[str] = []
+@functools.lru_cache(maxsize=1024)
+def _suffix_for(pic_mode: Any, seq_val: Any, drive: Any, exp: Any, film: Any,
+                adv: Any, sat: Any, recipe_tag: Optional[str]) -> str:
+    """File name suffix ("_[HDR][CL01][...]") for a set of tag values and matched recipe."""
+    parts: List[str] = []  # tag texts, bracketed when joined
     film_or_recipe_name: Optional[str] = None
 
     # 1) HDR
-    pic_mode = fetch(exif, "PictureMode", "")
     if isinstance(pic_mode, str) and "HDR" in pic_mode:
-        tags.append("[HDR]")
+        parts.append("HDR")
         logging.debug("Applied HDR tag")
 
     # 2) SequenceNumber + DriveMode
-    seq_val = fetch(exif, "SequenceNumber", 0)
-    drive   = fetch(exif, "DriveMode", "")
     try:
         seq = int(seq_val)
     except Exception:
@@ -152,64 +480,135 @@ def build_new_name(filepath: str, exif: dict, recipes: List[Dict[str, Any]]) ->
         elif "Continuous High" in drive:
             seq_tag = f"CH{seq:02d}"
         elif "Single" in drive:
-            exp = fetch(exif, "ExposureMode", "")
             if isinstance(exp, str) and "Auto bracket" in exp:
                 seq_tag = f"EB{seq:02d}"
     if seq_tag:
-        tags.append(f"[{seq_tag}]")
+        parts.append(seq_tag)
         logging.debug(f"Applied DriveMode tag: {seq_tag}")
     elif seq > 0:
-        tags.append(f"[{seq:02d}]")
+        parts.append(f"{seq:02d}")
         logging.debug(f"Applied raw SequenceNumber tag: {seq:02d}")
 
     # 3) Film/Recipe tag
-    if recipe_name:
-        film_or_recipe_name = recipe_name.replace(" ", "")
-        tags.append(f"[{film_or_recipe_name}]")
-        logging.debug(f"Applied Recipe tag: {recipe_name}")
+    if recipe_tag is not None:
+        film_or_recipe_name = recipe_tag
+        parts.append(film_or_recipe_name)
     else:
-        film = fetch(exif, "FilmMode", "")
         if isinstance(film, str) and film.strip():
             if "(" in film and ")" in film:
                 name = film.split("(", 1)[1].split(")", 1)[0].strip()
             else:
                 name = film.strip()
             film_or_recipe_name = name.replace(" ", "")
-            tags.append(f"[{film_or_recipe_name}]")
+            parts.append(film_or_recipe_name)
             logging.debug(f"Applied FilmMode tag: {name}")
 
     # 4) AdvancedFilter
-    adv = fetch(exif, "AdvancedFilter", "")
     if isinstance(adv, str) and adv.strip():
         adv_clean = adv.replace(" ", "")
-        tags.append(f"[{adv_clean}]")
+        parts.append(adv_clean)
         logging.debug(f"Applied AdvancedFilter tag: {adv}")
 
     # 5) Saturation — ONLY if no film/recipe tag was added and not "0 (normal)"
     if film_or_recipe_name is None:
-        sat = fetch(exif, "Saturation", "")
         if isinstance(sat, str):
             sc = sat.strip()
             if sc and sc.lower() != "0 (normal)":
                 sat_tag = sc.replace(" ", "")
-                tags.append(f"[{sat_tag}]")
+                parts.append(sat_tag)
                 logging.debug(f"Applied Saturation tag: {sc}")
     else:
         logging.debug("Skipped Saturation tag because Film/Recipe tag is present")
 
-    suffix = "_" + "".join(tags) if tags else ""
-    return f"{base}{suffix}{ext}"
+    return "_[" + "][".join(parts) + "]" if parts else ""
+
+def process_one(img: str, exif: Dict[str, Any], matcher: RecipeMatcher, dump_all: bool) -> str:
+    """Return the new file name for one image, dumping its EXIF first if asked to."""
+    if dump_all:
+        dump_all_exif(img, exif)
+    return build_new_name(img, exif, matcher)
+
+# recipe matcher for this process, set by init_worker (or main when running inline)
+_matcher = RecipeMatcher([])
+
+def init_worker(verbose: bool, extra_json: Optional[str]) -> None:
+    """Pool initializer: set up logging and load recipes once per worker process."""
+    global _matcher
+    setup_logging(verbose)
+    _matcher = RecipeMatcher(load_recipes(extra_json))
+
+def process_chunk(images: List[str], tags: Optional[List[str]]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Worker entry point: one exiftool daemon per chunk. Returns (src, newname) pairs
+    and the images whose EXIF couldn't be read (named as if they had no tags).
+    """
+    found: List[str] = []
+    for img in images:
+        if os.path.isfile(img):
+            found.append(img)
+        else:
+            logging.warning(f"Not found: {img}")
+    with ExifToolDaemon(tags) as daemon:
+        results = [(img, process_one(img, exif, _matcher, tags is None))
+                   for img, exif in daemon.iter_exif(found)]
+    return results, daemon.failed
+
+# below this many files per worker, a pool's interpreter + exiftool startup costs more than it saves
+MIN_FILES_PER_WORKER = 2 * ExifToolDaemon.WINDOW
 
-def main():
-    parser = argparse.ArgumentParser(description="xt5_exif_tool")
+def split_chunks(images: List[str], n: int) -> List[List[str]]:
+    """
+    Split images into at most n contiguous chunks, preserving order,
+    with at least MIN_FILES_PER_WORKER files in each.
+    """
+    n = max(1, min(n, len(images) // MIN_FILES_PER_WORKER))
+    size, extra = divmod(len(images), n)
+    chunks: List[List[str]] = []
+    start = 0
+    for i in range(n):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(images[start:end])
+        start = end
+    return chunks
+
+# os.replace shares os.rename's renameat() path but isn't listed in supports_dir_fd
+DIR_FD_RENAME = os.rename in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+def replace_in_dir(src: str, newname: str, dir_fds: Dict[str, int]) -> None:
+    """
+    os.replace src to newname in the same directory. Where supported, the
+    directory is opened once and reused while consecutive files share it, so
+    its path isn't resolved per file. Only one directory fd is kept in dir_fds;
+    moving to another directory closes it, so many directories can't hit EMFILE.
+    """
+    dirpath = os.path.dirname(src) or "."
+    if not DIR_FD_RENAME:
+        os.replace(src, os.path.join(dirpath, newname))
+        return
+    dfd = dir_fds.get(dirpath)
+    if dfd is None:
+        for old in dir_fds.values():
+            os.close(old)
+        dir_fds.clear()
+        dfd = dir_fds[dirpath] = os.open(dirpath, os.O_RDONLY | os.O_DIRECTORY)
+    os.replace(os.path.basename(src), newname, src_dir_fd=dfd, dst_dir_fd=dfd)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="xt5_exif_tool.py", description="xt5_exif_tool")
     parser.add_argument("-v", "--verbose", action="store_true",
                         help="enable logging to file")
     parser.add_argument("--rename", action="store_true",
                         help="actually rename files")
     parser.add_argument("--recipes-json", type=str, default=None,
                         help="JSON array of custom recipes to prepend (overrides defaults if matched)")
+    parser.add_argument("--dump-all", action="store_true",
+                        help="read every EXIF tag and write it to the log (needs -v)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of parallel workers (default: CPU count; use 1 for spinning disks)")
     parser.add_argument("images", nargs="*", help="image files to process")
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     # Support env var fallback if arg not provided
     extra_recipes_json = args.recipes_json or os.environ.get("user_custom_recipes")
@@ -228,27 +627,51 @@ def main():
     if args.verbose:
         sys.stderr.write(f"Logging enabled: details written to {LOG_FILE}\n")
 
-    recipes = load_recipes(extra_recipes_json)
+    global _matcher
+    _matcher = RecipeMatcher(load_recipes(extra_recipes_json))
 
-    for img in images:
-        if not os.path.isfile(img):
-            logging.warning(f"Not found: {img}")
-            continue
-        exif = get_exif_via_exiftool(img)
-        dump_all_exif(img, exif)
-        newname = build_new_name(img, exif, recipes)
-        dest = os.path.join(os.path.dirname(img) or ".", newname)
-
-        if args.rename:
-            try:
-                os.rename(img, dest)
-                logging.info(f"Renamed: {img} → {dest}")
-            except Exception as e:
-                logging.error(f"Failed to rename {img}: {e}")
-                sys.stderr.write(f"Error: could not rename {img}\n")
-                continue
-
-        print(newname)
+    tags = None if args.dump_all else exif_tags(_matcher)
+    chunks = split_chunks(images, args.jobs)
+    if len(chunks) == 1:
+        results, failed = process_chunk(chunks[0], tags)
+    else:
+        results, failed = [], []
+        with ProcessPoolExecutor(max_workers=len(chunks), initializer=init_worker,
+                                 initargs=(args.verbose, extra_recipes_json)) as pool:
+            for part, part_failed in pool.map(process_chunk, chunks, [tags] * len(chunks)):
+                results.extend(part)
+                failed.extend(part_failed)
+
+    # renames stay in the parent so they happen serially
+    dir_fds: Dict[str, int] = {}
+    out_buf: List[str] = []
+    try:
+        for img, newname in results:
+            # still listed, but no rename syscall for files that already have this name
+            if args.rename and newname != os.path.basename(img):
+                try:
+                    replace_in_dir(img, newname, dir_fds)
+                    dest = os.path.join(os.path.dirname(img) or ".", newname)
+                    logging.info(f"Renamed: {img} → {dest}")
+                except Exception as e:
+                    logging.error(f"Failed to rename {img}: {e}")
+                    sys.stderr.write(f"Error: could not rename {img}\n")
+                    continue
+
+            out_buf.append(newname)
+            if len(out_buf) >= OUTPUT_CHUNK:
+                sys.stdout.write("\n".join(out_buf) + "\n")
+                out_buf.clear()
+    finally:
+        if out_buf:
+            sys.stdout.write("\n".join(out_buf) + "\n")
+        for dfd in dir_fds.values():
+            os.close(dfd)
+
+    if failed:
+        for img in failed:
+            sys.stderr.write(f"Error: could not read EXIF for {img}\n")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()